@@ -1,13 +1,23 @@
 import tkinter as tk
 from tkinter import messagebox, scrolledtext
 from tkinter import filedialog
-import random, math, time
+import random, math, time, os
+import ast
+from array import array
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from bisect import bisect_left
+from collections import deque, OrderedDict
 from datetime import datetime
+from xml.sax.saxutils import escape
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import legal
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.pdfbase.pdfmetrics import stringWidth
 import matplotlib.pyplot as plt
+import numpy as np
+from numba import njit
 
 # ----------------------------
 # Globals
@@ -18,6 +28,11 @@ requirements = {}
 # Caches for efficiency
 _slot_parsed = {}          # slot_str -> (day, start_minutes)
 _course_teacher_cache = {} # course -> teacher (cached for speed)
+_pref_sets = {}            # teacher -> frozenset of preferred slots (O(1) membership)
+_cost_cache = OrderedDict() # tuple(timetable) -> cost, LRU of at most COST_CACHE_SIZE entries
+COST_CACHE_SIZE = 4096
+_enc = {}                  # integer-encoded inputs for the jitted cost, see _encode()
+_RAND_BLOCK = 1 << 16      # floats drawn per refill of a move-generator stream
 
 # ----------------------------
 # Tunable weights
@@ -33,6 +48,29 @@ WEIGHTS = {
     'malformed_slot': 20000
 }
 
+# positions of WEIGHTS entries inside the array passed to the jitted cost
+W_TEACHER_SLOT, W_ROOM_SLOT, W_NOT_PREFERRED, W_BACK_TO_BACK, W_GAP, W_TOO_MANY, W_MISSING, W_MALFORMED = range(8)
+_WEIGHT_KEYS = ('teacher_slot_conflict', 'room_slot_conflict', 'not_preferred', 'back_to_back',
+                'gap', 'too_many_sessions_day', 'missing_teacher', 'malformed_slot')
+
+# tabu list: number of recent move keys remembered, and redraws before a tabu move is taken anyway
+TABU_SIZE = 32
+TABU_TRIES = 4
+
+# minimum wall-clock seconds between live-plot frames (~10 fps)
+LIVE_PLOT_PERIOD = 0.1
+
+# SA chains run by generate_timetable() when the live plot is off (None = one per CPU)
+SA_CHAINS = None
+
+# moves with delta/T above this are rejected without calling exp() (e^-20 ~ 2e-9)
+EXP_CUTOFF = 20.0
+
+# SA acceptance table: exp(-delta/T) for integer deltas below EXP_TABLE_SIZE, rebuilt every
+# EXP_TABLE_EPOCH iterations (T drifts by alpha**EXP_TABLE_EPOCH, ~3% with the defaults)
+EXP_TABLE_SIZE = 256
+EXP_TABLE_EPOCH = 100
+
 # ----------------------------
 # Helper / Cache functions
 # ----------------------------
@@ -61,203 +99,591 @@ def refresh_caches():
     _course_teacher_cache.clear()
     for c in courses:
         _course_teacher_cache[c] = faculty.get(c, "")
+    _pref_sets.clear()
+    _pref_sets.update((t, frozenset(v or ())) for t, v in preferred_slots.items())  # falsy = no preferences
+    _cost_cache.clear()
+    _encode()
+
+def _encode():
+    """Assign small integer ids to courses/teachers/rooms/slots/days and build the
+       lookup arrays used by the jitted cost function."""
+    _enc.clear()
+    # preferred slots may name slots that are not in `slots`, give them ids too
+    all_slots = list(dict.fromkeys(list(slots) + [s for v in preferred_slots.values() for s in v or ()]))
+    teachers = list(dict.fromkeys(t for t in _course_teacher_cache.values() if t))
+    course_ids = {c: i for i, c in enumerate(courses)}
+    teacher_ids = {t: i for i, t in enumerate(teachers)}
+    slot_ids = {s: i for i, s in enumerate(all_slots)}
+    room_ids = {r: i for i, r in enumerate(rooms)}
+    day_ids = {}
+
+    course_to_teacher_id = np.array([teacher_ids.get(_course_teacher_cache[c], -1) for c in courses], dtype=np.int32)
+    # slots are parsed once here; malformed ones are flagged in slot_valid instead of raising later
+    slot_to_day = np.zeros(len(all_slots), dtype=np.int32)
+    slot_to_start = np.zeros(len(all_slots), dtype=np.int32)
+    slot_valid = np.zeros(len(all_slots), dtype=np.uint8)
+    for i, s in enumerate(all_slots):
+        try:
+            day, start_minutes = parse_slot(s)
+        except Exception:
+            continue
+        slot_to_day[i] = day_ids.setdefault(day, len(day_ids))
+        slot_to_start[i] = start_minutes
+        slot_valid[i] = 1
+
+    # pref_mask[t, s] == 1 when slot s is acceptable for teacher t (teachers without prefs accept all)
+    pref_mask = np.ones((len(teachers), len(all_slots)), dtype=np.uint8)
+    for t, tid in teacher_ids.items():
+        prefs = _pref_sets.get(t)
+        if prefs:
+            pref_mask[tid, :] = 0
+            for s in prefs:
+                pref_mask[tid, slot_ids[s]] = 1
+
+    # per-course preferred slot ids as CSR arrays (pref_ptr[c]:pref_ptr[c+1] into pref_sids) for _sa_loop()
+    course_pref_sids = [[slot_ids[s] for s in preferred_slots.get(_course_teacher_cache[c]) or []] for c in courses]
+    pref_ptr = np.zeros(len(courses) + 1, dtype=np.int32)
+    pref_ptr[1:] = np.cumsum([len(p) for p in course_pref_sids])
+    pref_sids = np.array([s for p in course_pref_sids for s in p], dtype=np.int32)
+
+    _enc.update(
+        course_ids=course_ids, teacher_ids=teacher_ids, slot_ids=slot_ids, room_ids=room_ids, day_ids=day_ids,
+        course_names=list(courses), slot_names=all_slots, room_names=list(rooms),
+        course_to_teacher_id=course_to_teacher_id, slot_to_day=slot_to_day, slot_to_start=slot_to_start,
+        slot_valid=slot_valid, pref_mask=pref_mask,
+        # plain-list views for the interpreted SA loop (list indexing beats numpy scalar access)
+        course_teacher=course_to_teacher_id.tolist(), slot_day_list=slot_to_day.tolist(),
+        slot_start_list=slot_to_start.tolist(), slot_valid_list=slot_valid.tolist(), pref_rows=pref_mask.tolist(),
+        slot_choices=[slot_ids[s] for s in slots], room_choices=[room_ids[r] for r in rooms],
+        course_pref_sids=course_pref_sids,
+        slot_choice_arr=np.array([slot_ids[s] for s in slots], dtype=np.int32),
+        room_choice_arr=np.array([room_ids[r] for r in rooms], dtype=np.int32),
+        pref_ptr=pref_ptr, pref_sids=pref_sids,
+        weights=np.array([WEIGHTS[k] for k in _WEIGHT_KEYS], dtype=np.int64),
+        # occupancy buffers reused by every _cost() call
+        faculty_occ=np.zeros((len(teachers), len(all_slots)), dtype=np.int8),
+        room_occ=np.zeros((len(rooms), len(all_slots)), dtype=np.int8),
+    )
+
+def encode_entries(timetable):
+    """Convert [(course, slot, room), ...] into [(course_id, slot_id, room_id), ...]."""
+    course_ids, slot_ids, room_ids = _enc['course_ids'], _enc['slot_ids'], _enc['room_ids']
+    return [(course_ids[c], slot_ids[s], room_ids[r]) for c, s, r in timetable]
+
+def decode_entries(entries):
+    """Inverse of encode_entries()."""
+    course_names, slot_names, room_names = _enc['course_names'], _enc['slot_names'], _enc['room_names']
+    return [(course_names[c], slot_names[s], room_names[r]) for c, s, r in entries]
+
+def encode_timetable(timetable):
+    """Convert [(course, slot, room), ...] into an int32 array of (course_id, slot_id, room_id) rows."""
+    return np.array(encode_entries(timetable), dtype=np.int32).reshape(-1, 3)
 
 # ----------------------------
-# Cost Function (optimized)
+# Cost Function (jitted over encoded timetables)
 # ----------------------------
-def cost_function(timetable):
+@njit(cache=True, inline='always')
+def _sift_down(a, root, end):
+    """Restore the max-heap property of a[root:end] below root."""
+    item = a[root]
+    child = 2 * root + 1
+    while child < end:
+        if child + 1 < end and a[child + 1] > a[child]:
+            child += 1
+        if a[child] <= item:
+            break
+        a[root] = a[child]
+        root = child
+        child = 2 * root + 1
+    a[root] = item
+
+@njit(cache=True)
+def _heapsort(a, n):
+    """Sort a[:n] in place; unlike ndarray.sort() in numba, never allocates."""
+    for start in range(n // 2 - 1, -1, -1):
+        _sift_down(a, start, n)
+    for end in range(n - 1, 0, -1):
+        a[0], a[end] = a[end], a[0]
+        _sift_down(a, 0, end)
+
+@njit(cache=True, inline='always')
+def _cost_core(tt, course_to_teacher, slot_day, slot_start, slot_valid, pref_mask, fac_occ, room_occ, keys,
+               weights, n_days):
     """
-    Optimized cost: uses local variables, cached parsed slots and teacher lookups
-    to minimize repeated string parsing and dictionary lookups inside loops.
+    Native cost over an encoded timetable (rows of course_id, slot_id, room_id).
+    weights is a tuple in _WEIGHT_KEYS order; fac_occ / room_occ are scratch
+    occupancy buffers, cleared on entry, and keys is an int64 scratch buffer of
+    at least len(tt) entries. Inlined into _cost() and _sa_loop().
     """
+    fac_occ.fill(0)
+    room_occ.fill(0)
     penalty = 0
-    used_faculty = set()   # (teacher, slot)
-    used_rooms = set()     # (room, slot)
-    faculty_schedule = {}  # teacher -> day -> list of start minutes
-
-    # localize frequently used globals for speed
-    local_pref = preferred_slots
-    local_weights = WEIGHTS
-    local_course_teacher = _course_teacher_cache
-
-    for (course, slot, room) in timetable:
-        teacher = local_course_teacher.get(course, "")
-        if not teacher:
-            penalty += local_weights['missing_teacher']
+    n = tt.shape[0]
+    # (teacher, day, start) packed into one sortable key for the day-level pass
+    n_keys = 0
+
+    for k in range(n):
+        t = course_to_teacher[tt[k, 0]]
+        s = tt[k, 1]
+        r = tt[k, 2]
+        if t < 0:
+            penalty += weights[W_MISSING]
             continue
 
-        key_fac = (teacher, slot)
-        if key_fac in used_faculty:
-            penalty += local_weights['teacher_slot_conflict']
+        if fac_occ[t, s]:
+            penalty += weights[W_TEACHER_SLOT]
         else:
-            used_faculty.add(key_fac)
+            fac_occ[t, s] = 1
 
-        key_room = (room, slot)
-        if key_room in used_rooms:
-            penalty += local_weights['room_slot_conflict']
+        if room_occ[r, s]:
+            penalty += weights[W_ROOM_SLOT]
         else:
-            used_rooms.add(key_room)
+            room_occ[r, s] = 1
 
-        # preferred slot check (fast membership checks)
-        if teacher in local_pref and local_pref[teacher]:
-            if slot not in local_pref[teacher]:
-                penalty += local_weights['not_preferred']
+        if not pref_mask[t, s]:
+            penalty += weights[W_NOT_PREFERRED]
 
-        # parse slot using cached parse_slot (fast)
-        try:
-            day, start_minutes = parse_slot(slot)
-        except Exception:
-            penalty += local_weights['malformed_slot']
+        if not slot_valid[s]:
+            penalty += weights[W_MALFORMED]
             continue
+        keys[n_keys] = ((t * n_days + slot_day[s]) << 20) + slot_start[s]
+        n_keys += 1
+
+    # day-level penalties: sorted keys group each teacher/day with ascending starts
+    _heapsort(keys, n_keys)
+    i = 0
+    while i < n_keys:
+        group = keys[i] >> 20
+        j = i + 1
+        while j < n_keys and (keys[j] >> 20) == group:
+            diff = (keys[j] & 0xFFFFF) - (keys[j - 1] & 0xFFFFF)
+            if 0 < diff <= 60:
+                penalty += weights[W_BACK_TO_BACK]
+            elif diff > 60:
+                penalty += weights[W_GAP]
+            j += 1
+        if j - i >= 5:  # too many sessions/day
+            penalty += weights[W_TOO_MANY] * (j - i - 4)
+        i = j
+    return penalty
+
+@njit(cache=True)
+def _cost(tt, course_to_teacher, slot_day, slot_start, slot_valid, pref_mask, weights, fac_occ, room_occ):
+    """Jitted cost: weights come in as an array (_WEIGHT_KEYS order) and n_days is derived from slot_day."""
+    n_days = slot_day.max() + 1 if slot_day.shape[0] else 1
+    w = (weights[0], weights[1], weights[2], weights[3], weights[4], weights[5], weights[6], weights[7])
+    keys = np.empty(tt.shape[0], dtype=np.int64)
+    return _cost_core(tt, course_to_teacher, slot_day, slot_start, slot_valid, pref_mask, fac_occ, room_occ, keys,
+                      w, n_days)
+
+def cost_function(timetable):
+    """Full cost of a [(course, slot, room), ...] timetable, evaluated by the jitted _cost().
+       Results are memoized per timetable in a small LRU cache, cleared by refresh_caches()."""
+    key = tuple(timetable)
+    cost = _cost_cache.get(key)
+    if cost is not None:
+        _cost_cache.move_to_end(key)
+        return cost
+    e = _enc
+    cost = int(_cost(encode_timetable(timetable), e['course_to_teacher_id'], e['slot_to_day'], e['slot_to_start'],
+                     e['slot_valid'], e['pref_mask'], e['weights'], e['faculty_occ'], e['room_occ']))
+    _cost_cache[key] = cost
+    if len(_cost_cache) > COST_CACHE_SIZE:
+        _cost_cache.popitem(last=False)
+    return cost
 
-        # accumulate teacher day schedule
-        faculty_schedule.setdefault(teacher, {}).setdefault(day, []).append(start_minutes)
-
-    # day-level penalties (iterate over schedules)
-    for teacher, days in faculty_schedule.items():
-        for day, starts in days.items():
-            starts.sort()
-            n = len(starts)
-            if n >= 5:  # too many sessions/day
-                penalty += local_weights['too_many_sessions_day'] * (n - 4)
-            # consecutive pairs
-            for i in range(1, n):
-                diff = starts[i] - starts[i - 1]
-                if 0 < diff <= 60:
-                    penalty += local_weights['back_to_back']
-                elif diff > 60:
-                    penalty += local_weights['gap']
+# ----------------------------
+# Incremental (delta) cost
+# ----------------------------
+def _pair_penalty(prev_start, next_start):
+    """Penalty for two consecutive starts of the same teacher on the same day."""
+    diff = next_start - prev_start
+    if 0 < diff <= 60:
+        return WEIGHTS['back_to_back']
+    if diff > 60:
+        return WEIGHTS['gap']
+    return 0
+
+def _splice_penalty(prev_start, start_minutes, next_start):
+    """Pair penalties gained by placing start_minutes between two neighbouring starts
+       of a sorted day list (None at either end); the prev/next pair stops being adjacent."""
+    penalty = 0
+    if prev_start is not None:
+        penalty += _pair_penalty(prev_start, start_minutes)
+    if next_start is not None:
+        penalty += _pair_penalty(start_minutes, next_start)
+        if prev_start is not None:
+            penalty -= _pair_penalty(prev_start, next_start)
+    return penalty
+
+def _add_entry(counters, entry):
+    """Register an encoded (course_id, slot_id, room_id) entry in counters and return the penalty it adds."""
+    cid, sid, rid = entry
+    e = _enc
+    tid = e['course_teacher'][cid]
+    if tid < 0:
+        return WEIGHTS['missing_teacher']
+
+    penalty = 0
+    n_slots = counters['n_slots']
+    faculty_occ = counters['faculty_occ']
+    idx = tid * n_slots + sid
+    count = faculty_occ[idx]
+    if count:
+        penalty += WEIGHTS['teacher_slot_conflict']
+    faculty_occ[idx] = count + 1
+
+    room_occ = counters['room_occ']
+    idx = rid * n_slots + sid
+    count = room_occ[idx]
+    if count:
+        penalty += WEIGHTS['room_slot_conflict']
+    room_occ[idx] = count + 1
+
+    if not e['pref_rows'][tid][sid]:
+        penalty += WEIGHTS['not_preferred']
+
+    if not e['slot_valid_list'][sid]:
+        return penalty + WEIGHTS['malformed_slot']
+    start_minutes = e['slot_start_list'][sid]
+
+    # insort into the day list (kept sorted across iterations, never re-sorted);
+    # only the pairs around the insertion point change
+    starts = counters['teacher_day_starts'][tid][e['slot_day_list'][sid]]
+    n = len(starts)
+    i = bisect_left(starts, start_minutes)
+    penalty += _splice_penalty(starts[i - 1] if i > 0 else None, start_minutes, starts[i] if i < n else None)
+    if n >= 4:  # the 5th+ session of the day
+        penalty += WEIGHTS['too_many_sessions_day']
+    starts.insert(i, start_minutes)
     return penalty
 
+def _remove_entry(counters, entry):
+    """Unregister an encoded entry from counters and return the penalty it contributed."""
+    cid, sid, rid = entry
+    e = _enc
+    tid = e['course_teacher'][cid]
+    if tid < 0:
+        return WEIGHTS['missing_teacher']
+
+    penalty = 0
+    n_slots = counters['n_slots']
+    faculty_occ = counters['faculty_occ']
+    idx = tid * n_slots + sid
+    count = faculty_occ[idx]
+    if count > 1:
+        penalty += WEIGHTS['teacher_slot_conflict']
+    faculty_occ[idx] = count - 1
+
+    room_occ = counters['room_occ']
+    idx = rid * n_slots + sid
+    count = room_occ[idx]
+    if count > 1:
+        penalty += WEIGHTS['room_slot_conflict']
+    room_occ[idx] = count - 1
+
+    if not e['pref_rows'][tid][sid]:
+        penalty += WEIGHTS['not_preferred']
+
+    if not e['slot_valid_list'][sid]:
+        return penalty + WEIGHTS['malformed_slot']
+    start_minutes = e['slot_start_list'][sid]
+
+    # locate via bisect and delete in place, mirroring _add_entry()
+    starts = counters['teacher_day_starts'][tid][e['slot_day_list'][sid]]
+    n = len(starts)
+    i = bisect_left(starts, start_minutes)
+    penalty += _splice_penalty(starts[i - 1] if i > 0 else None, start_minutes, starts[i + 1] if i + 1 < n else None)
+    if n >= 5:
+        penalty += WEIGHTS['too_many_sessions_day']
+    del starts[i]
+    return penalty
+
+def build_counters(timetable):
+    """Build the occupancy counters used by delta_cost() for a full encoded timetable.
+       Teacher/room slot occupancy lives in flat unsigned-int arrays indexed by id * n_slots + slot_id."""
+    n_slots = len(_enc['slot_ids'])
+    n_days = len(_enc['day_ids'])
+    counters = {
+        'n_slots': n_slots,
+        'faculty_occ': array('I', [0]) * (len(_enc['teacher_ids']) * n_slots),
+        'room_occ': array('I', [0]) * (len(_enc['room_ids']) * n_slots),
+        # sorted start minutes, indexed [teacher_id][day_id]
+        'teacher_day_starts': [[[] for _ in range(n_days)] for _ in range(len(_enc['teacher_ids']))],
+    }
+    for entry in timetable:
+        _add_entry(counters, entry)
+    return counters
+
+def delta_cost(edits, counters):
+    """
+    Cost change of applying edits [(index, old_entry, new_entry), ...].
+    Counters are updated as if the edits were accepted; call undo_edits() on reject.
+    """
+    delta = 0
+    for _, old, new in edits:
+        delta -= _remove_entry(counters, old)
+        delta += _add_entry(counters, new)
+    return delta
+
+def undo_edits(edits, counters):
+    """Restore counters to their state before delta_cost(edits, counters)."""
+    for _, old, new in reversed(edits):
+        _remove_entry(counters, new)
+        _add_entry(counters, old)
+
 # ----------------------------
 # SA neighbor / init (small improvements)
 # ----------------------------
-def random_solution():
+def make_stream(seed=None):
+    """Random stream for the move generator: a numpy Generator plus a block of
+       pre-drawn floats that the move generator consumes by index."""
+    gen = np.random.default_rng(seed)
+    return {'gen': gen, 'buf': gen.random(_RAND_BLOCK).tolist(), 'pos': 0}
+
+_stream = make_stream()  # default stream for random_solution() / propose()
+
+def seed_stream(seed):
+    """Reseed the module-level stream (used when starting an SA chain)."""
+    _stream.update(make_stream(seed))
+
+def random_solution(stream=None):
     """Generate a random initial timetable with bias toward preferred slots.
-       Use local references to avoid repeated global lookups."""
+       All draws come from one vectorized call on the stream's generator."""
+    gen = (stream or _stream)['gen']
     timetable = []
     local_slots = slots
     local_rooms = rooms
     local_pref = preferred_slots
     local_faculty = faculty
+    n_slots, n_rooms = len(local_slots), len(local_rooms)
 
+    draws = gen.random((sum(requirements.get(c, 1) for c in courses), 3)).tolist()
+    k = 0
     for course in courses:
         count = requirements.get(course, 1)
+        teacher = local_faculty.get(course, "")
+        prefs = local_pref.get(teacher)
         for _ in range(count):
-            teacher = local_faculty.get(course, "")
-            if teacher in local_pref and local_pref[teacher]:
-                slot = random.choice(local_pref[teacher]) if random.random() < 0.8 else random.choice(local_slots)
+            u_pref, u_slot, u_room = draws[k]
+            k += 1
+            if prefs and u_pref < 0.8:
+                slot = prefs[int(u_slot * len(prefs))]
             else:
-                slot = random.choice(local_slots)
-            room = random.choice(local_rooms)
+                slot = local_slots[int(u_slot * n_slots)]
+            room = local_rooms[int(u_room * n_rooms)]
             timetable.append((course, slot, room))
     return timetable
 
-def neighbor_solution(timetable):
-    """Create a neighbor timetable by swapping or mutating assignments.
-       Works in-place on a shallow copy to reduce allocation cost."""
-    if not timetable:
-        return []
-    new_tt = list(timetable)  # shallow copy
-    move = random.random()
-    L = len(new_tt)
+def _propose(timetable, stream):
+    """Draw one random move on an encoded timetable and return its edits
+       [(index, old_entry, new_entry), ...] without applying them.
+       Each call takes 6 floats from the stream's buffer."""
+    buf, pos = stream['buf'], stream['pos']
+    if pos + 6 > len(buf):
+        buf = stream['buf'] = stream['gen'].random(_RAND_BLOCK).tolist()
+        pos = 0
+    stream['pos'] = pos + 6
+    move, u1, u2, u3, u4, u5 = buf[pos:pos + 6]
+
+    L = len(timetable)
     if move < 0.45 and L >= 2:
-        i, j = random.sample(range(L), 2)
-        c1, s1, r1 = new_tt[i]
-        c2, s2, r2 = new_tt[j]
-        if random.random() < 0.7:
+        # two distinct indices
+        i = int(u1 * L)
+        j = int(u2 * (L - 1))
+        if j >= i:
+            j += 1
+        c1, s1, r1 = old_i = timetable[i]
+        c2, s2, r2 = old_j = timetable[j]
+        if u3 < 0.7:
             # swap slots only
-            new_tt[i] = (c1, s2, r1)
-            new_tt[j] = (c2, s1, r2)
-        else:
-            # swap entire assignments
-            new_tt[i], new_tt[j] = new_tt[j], new_tt[i]
+            return [(i, old_i, (c1, s2, r1)), (j, old_j, (c2, s1, r2))]
+        # swap entire assignments
+        return [(i, old_i, old_j), (j, old_j, old_i)]
     elif move < 0.85:
-        idx = random.randrange(L)
-        c, _, r = new_tt[idx]
-        teacher = faculty.get(c, "")
-        if teacher in preferred_slots and preferred_slots[teacher] and random.random() < 0.7:
-            new_slot = random.choice(preferred_slots[teacher])
-        else:
-            new_slot = random.choice(slots)
-        if random.random() < 0.25:
-            new_tt[idx] = (c, new_slot, r)
-        else:
-            new_tt[idx] = (c, new_slot, random.choice(rooms))
-    else:
-        idx = random.randrange(L)
-        c, s, _ = new_tt[idx]
-        new_tt[idx] = (c, s, random.choice(rooms))
-    return new_tt
+        idx = int(u1 * L)
+        c, _, r = old = timetable[idx]
+        prefs = _enc['course_pref_sids'][c]
+        if not (prefs and u2 < 0.7):
+            prefs = _enc['slot_choices']
+        new_slot = prefs[int(u3 * len(prefs))]
+        if u4 >= 0.25:
+            room_choices = _enc['room_choices']
+            r = room_choices[int(u5 * len(room_choices))]
+        return [(idx, old, (c, new_slot, r))]
+    idx = int(u1 * L)
+    c, s, _ = old = timetable[idx]
+    room_choices = _enc['room_choices']
+    return [(idx, old, (c, s, room_choices[int(u2 * len(room_choices))]))]
+
+def propose(timetable, stream=None, tabu=None):
+    """Move an encoded timetable to a neighbor by swapping or mutating assignments, in place.
+       Returns the edits [(index, old_entry, new_entry), ...]; undo them with rollback() on reject.
+       Uses the module stream unless one is given; with a tabu list, moves touching a tabu
+       (index, course_id, slot_id, room_id) are redrawn up to TABU_TRIES times, then taken anyway."""
+    if not timetable:
+        return []
+    stream = stream or _stream
+    edits = _propose(timetable, stream)
+    if tabu is not None:
+        members = tabu['members']
+        for _ in range(TABU_TRIES):
+            for idx, _, new in edits:
+                if (idx, *new) in members:
+                    break
+            else:
+                break
+            edits = _propose(timetable, stream)
+
+    for idx, _, new in edits:
+        timetable[idx] = new
+    return edits
+
+def rollback(timetable, edits):
+    """Undo edits applied by propose()."""
+    for idx, old, _ in reversed(edits):
+        timetable[idx] = old
+
+def make_tabu(size=TABU_SIZE):
+    """Short-term memory of recent (index, course_id, slot_id, room_id) assignments: a bounded
+       queue for ageing plus a set mirror for O(1) membership."""
+    return {'recent': deque(maxlen=size), 'members': set()}
+
+def tabu_push(tabu, keys):
+    """Add (index, course_id, slot_id, room_id) keys, evicting the oldest ones past the size limit."""
+    recent, members = tabu['recent'], tabu['members']
+    for key in keys:
+        if key in members:
+            continue
+        if len(recent) == recent.maxlen:
+            members.discard(recent[0])
+        recent.append(key)
+        members.add(key)
 
 # ----------------------------
-# Simulated Annealing (kept behavior; micro-optimizations)
+# Simulated Annealing (kept behavior; incremental delta cost)
 # ----------------------------
-def simulated_annealing(max_iter=120000, T0=500.0, alpha=0.9997, stop_if_zero=True, live_plot=False, update_interval=None):
+def _rewind(timetable, edit_log):
+    """Copy of timetable with the edit batches in edit_log undone, newest first."""
+    tt = list(timetable)
+    for edits in reversed(edit_log):
+        for idx, old, _ in reversed(edits):
+            tt[idx] = old
+    return tt
+
+def simulated_annealing(max_iter=120000, T0=500.0, alpha=0.9997, stop_if_zero=True, live_plot=False, update_interval=None,
+                        tabu_size=TABU_SIZE):
     start_time = time.perf_counter()
-    current = random_solution()
-    current_cost = cost_function(current)
-    best, best_cost = current[:], current_cost
+    initial = random_solution()
+    current_cost = cost_function(initial)
+    current = encode_entries(initial)  # the loop works on (course_id, slot_id, room_id) tuples
+    counters = build_counters(current)  # kept in sync with `current` for delta_cost()
+    # best is not copied on every improvement: it is `current` rewound by the edits
+    # accepted since, materialized only once that log outgrows the timetable
+    best_cost = current_cost
+    best_log, best_snapshot = [], None
+    # tabu: rejected moves, and the assignments accepted moves just replaced (no immediate undo);
+    # tabu_size=0 disables it
+    tabu = make_tabu(tabu_size) if tabu_size else None
 
     T = T0
-    history = {'iter': [], 'current_cost': [], 'best_cost': []}
-
-    # Setup live plot if requested (reduce redraws using update_interval)
+    # preallocated cost history, trimmed to the iterations actually run
+    hist_iter = np.arange(1, max_iter + 1, dtype=np.int64)
+    hist_current = np.empty(max_iter, dtype=np.int64)
+    hist_best = np.empty(max_iter, dtype=np.int64)
+    n_hist = 0
+
+    # Setup live plot if requested: animated artists are blitted over a cached
+    # background at most once per LIVE_PLOT_PERIOD and GUI events are pumped with
+    # flush_events() (no plt.pause() sleep, no interactive mode); update_interval thins the plotted points
     if live_plot:
-        plt.ion()
         fig, ax = plt.subplots(figsize=(9, 4))
-        line_current, = ax.plot([], [], label='Current Cost', linewidth=1)
-        line_best, = ax.plot([], [], label='Best Cost', linewidth=2)
+        line_current, = ax.plot([], [], label='Current Cost', linewidth=1, animated=True)
+        line_best, = ax.plot([], [], label='Best Cost', linewidth=2, animated=True)
         ax.set_xlabel('Iteration')
         ax.set_ylabel('Cost')
         ax.set_title('Simulated Annealing Progress (Live)')
         ax.grid(True, linestyle='--', alpha=0.4)
         ax.legend(loc='upper right', frameon=True)
-        text_box = ax.text(0.02, 0.95, "", transform=ax.transAxes, va='top', fontsize=9,
+        text_box = ax.text(0.02, 0.95, "", transform=ax.transAxes, va='top', fontsize=9, animated=True,
                            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+        # fixed limits so frames can be blitted; y only grows if the current cost overshoots
+        ax.set_xlim(0, max_iter)
+        ax.set_ylim(0, max(current_cost, 1) * 1.05)
+
+        # re-capture the static background after every full draw (first show, resize, rescale)
+        blit = {'background': None}
+        def on_draw(event):
+            blit['background'] = fig.canvas.copy_from_bbox(ax.bbox)
+        fig.canvas.mpl_connect('draw_event', on_draw)
+        plt.show(block=False)
+        fig.canvas.draw()
+        last_draw = float('-inf')
 
         if update_interval is None:
             update_interval = max(1, int(max_iter / 300))
 
-        plot_iters = []
-        plot_current = []
-        plot_best = []
-
-    # main loop
+    # main loop (bind hot callables locally to skip attribute lookups)
+    _exp, _rand = math.exp, random.random
+    table_until = 0
     for it in range(1, max_iter + 1):
         if T <= 1e-8:
             break
-        neighbor = neighbor_solution(current)
-        neighbor_cost = cost_function(neighbor)
-        delta = neighbor_cost - current_cost
-
-        # acceptance
-        if delta < 0 or random.random() < math.exp(-delta / max(T, 1e-9)):
-            current, current_cost = neighbor, neighbor_cost
+        if it >= table_until:
+            exp_table = np.exp(-np.arange(EXP_TABLE_SIZE) / max(T, 1e-9)).tolist()
+            table_until = it + EXP_TABLE_EPOCH
+        edits = propose(current, tabu=tabu)
+        delta = delta_cost(edits, counters)
+
+        # acceptance: small (integer) deltas read the table, near-certain rejections skip exp() and the draw
+        if delta < 0:
+            accept = True
+        elif delta < EXP_TABLE_SIZE:
+            accept = _rand() < exp_table[delta]
+        else:
+            ratio = delta / max(T, 1e-9)
+            accept = ratio < EXP_CUTOFF and _rand() < _exp(-ratio)
+        if accept:
+            current_cost += delta
+            if tabu is not None:
+                tabu_push(tabu, [(idx, *old) for idx, old, _ in edits])
             if current_cost < best_cost:
-                best, best_cost = current[:], current_cost
-
-        history['iter'].append(it)
-        history['current_cost'].append(current_cost)
-        history['best_cost'].append(best_cost)
-
-        if live_plot and (it % update_interval == 0 or it == 1):
-            plot_iters.append(it)
-            plot_current.append(current_cost)
-            plot_best.append(best_cost)
-
-            line_current.set_xdata(plot_iters)
-            line_current.set_ydata(plot_current)
-            line_best.set_xdata(plot_iters)
-            line_best.set_ydata(plot_best)
-
-            # autoscale only on data update (fewer calls)
-            ax.relim()
-            ax.autoscale_view()
-
-            text_box.set_text(f"Iter: {it}\nCurrent: {current_cost}\nBest: {best_cost}\nT: {T:.4f}")
-            plt.draw()
-            plt.pause(0.001)
+                best_cost = current_cost
+                best_log.clear()
+                best_snapshot = None
+            elif best_snapshot is None:
+                best_log.append(edits)
+                if len(best_log) > len(current):
+                    best_snapshot = _rewind(current, best_log)
+                    best_log.clear()
+        else:
+            rollback(current, edits)
+            undo_edits(edits, counters)
+            if tabu is not None:
+                tabu_push(tabu, [(idx, *new) for idx, _, new in edits])
+
+        hist_current[it - 1] = current_cost
+        hist_best[it - 1] = best_cost
+        n_hist = it
+
+        if live_plot:
+            now = time.perf_counter()
+            if now - last_draw >= LIVE_PLOT_PERIOD:
+                last_draw = now
+                # strided views of the history, one point per update_interval
+                line_current.set_data(hist_iter[:it:update_interval], hist_current[:it:update_interval])
+                line_best.set_data(hist_iter[:it:update_interval], hist_best[:it:update_interval])
+                text_box.set_text(f"Iter: {it}\nCurrent: {current_cost}\nBest: {best_cost}\nT: {T:.4f}")
+
+                if current_cost > ax.get_ylim()[1]:
+                    ax.set_ylim(0, current_cost * 1.05)
+                    fig.canvas.draw()  # full redraw, refreshes the background via on_draw
+                fig.canvas.restore_region(blit['background'])
+                ax.draw_artist(line_current)
+                ax.draw_artist(line_best)
+                ax.draw_artist(text_box)
+                fig.canvas.blit(ax.bbox)
+                fig.canvas.flush_events()
 
         if stop_if_zero and best_cost == 0:
             break
@@ -267,38 +693,275 @@ def simulated_annealing(max_iter=120000, T0=500.0, alpha=0.9997, stop_if_zero=Tr
     elapsed = time.perf_counter() - start_time
 
     if live_plot:
-        # final plot update
-        plot_iters.append(it)
-        plot_current.append(current_cost)
-        plot_best.append(best_cost)
-
-        line_current.set_xdata(plot_iters)
-        line_current.set_ydata(plot_current)
-        line_best.set_xdata(plot_iters)
-        line_best.set_ydata(plot_best)
+        # final plot update (regular full draw, no blitting)
+        for artist in (line_current, line_best, text_box):
+            artist.set_animated(False)
+        line_current.set_data(hist_iter[:n_hist], hist_current[:n_hist])
+        line_best.set_data(hist_iter[:n_hist], hist_best[:n_hist])
         ax.relim()
         ax.autoscale_view()
         text_box.set_text(f"Done\nIter: {it}\nCurrent: {current_cost}\nBest: {best_cost}\nElapsed: {elapsed:.2f}s")
-        plt.draw()
-        plt.ioff()
-        plt.show()
+        # non-blocking: the window stays open under the Tk main loop while results are shown
+        fig.canvas.draw_idle()
+        fig.canvas.flush_events()
+        plt.show(block=False)
 
-    return best, best_cost, history, elapsed
+    best = best_snapshot if best_snapshot is not None else _rewind(current, best_log)
+    history = {'iter': hist_iter[:n_hist], 'current_cost': hist_current[:n_hist], 'best_cost': hist_best[:n_hist]}
+    return decode_entries(best), best_cost, history, elapsed
+
+# ----------------------------
+# Parallel tempering (replica exchange)
+# ----------------------------
+def parallel_tempering(max_iter=120000, temperatures=(0.3, 0.6, 1.2, 2.5, 5.0, 10.0), swap_every=100,
+                       stop_if_zero=True, seed=None):
+    """
+    Run one replica per fixed temperature, each making max_iter local moves.
+    Every swap_every moves, adjacent replicas try to exchange states with
+    probability min(1, exp((1/T_i - 1/T_j) * (E_i - E_j))), so the cold replica
+    can pick up states that escaped a basin at higher temperature.
+    The default ladder follows WEIGHTS: the cold end sits below the smallest soft
+    penalty (1) so those settle, and the hot end near too_many_sessions_day (10)
+    so day loads can still be traded; hard conflicts are never worth crossing.
+    Returns (best, best_cost, history, elapsed); history follows the coldest replica.
+    """
+    start_time = time.perf_counter()
+    temperatures = sorted(temperatures)
+    M = len(temperatures)
+    seeder = random.Random(seed)
+    rngs = [random.Random(seeder.getrandbits(32)) for _ in range(M)]       # acceptance tests
+    streams = [make_stream(seeder.getrandbits(32)) for _ in range(M)]    # move generation
+
+    _exp = math.exp
+    # fixed temperatures, so each replica's acceptance table is built once
+    exp_tables = [np.exp(-np.arange(EXP_TABLE_SIZE) / T).tolist() for T in temperatures]
+    states, costs, counters = [], [], []
+    for r in range(M):
+        initial = random_solution(streams[r])
+        states.append(encode_entries(initial))
+        costs.append(cost_function(initial))
+        counters.append(build_counters(states[-1]))
+    best_cost = min(costs)
+    best = states[costs.index(best_cost)][:]
+    n_blocks = -(-max_iter // swap_every)
+    hist_iter = np.empty(n_blocks, dtype=np.int64)
+    hist_current = np.empty(n_blocks, dtype=np.int64)
+    hist_best = np.empty(n_blocks, dtype=np.int64)
+    n_hist = 0
+
+    it = 0
+    while it < max_iter and not (stop_if_zero and best_cost == 0):
+        block = min(swap_every, max_iter - it)
+        for r in range(M):
+            T, stream, ctr, exp_table = temperatures[r], streams[r], counters[r], exp_tables[r]
+            _rand = rngs[r].random
+            current, current_cost = states[r], costs[r]
+            for _ in range(block):
+                edits = propose(current, stream)
+                delta = delta_cost(edits, ctr)
+                if delta < 0:
+                    accept = True
+                elif delta < EXP_TABLE_SIZE:
+                    accept = _rand() < exp_table[delta]
+                else:
+                    accept = delta < EXP_CUTOFF * T and _rand() < _exp(-delta / T)
+                if accept:
+                    current_cost += delta
+                    if current_cost < best_cost:
+                        best, best_cost = current[:], current_cost
+                else:
+                    rollback(current, edits)
+                    undo_edits(edits, ctr)
+            costs[r] = current_cost
+
+        # replica exchange between neighbouring temperatures
+        for r in range(M - 1):
+            x = (1.0 / temperatures[r] - 1.0 / temperatures[r + 1]) * (costs[r] - costs[r + 1])
+            if x >= 0 or seeder.random() < math.exp(x):
+                states[r], states[r + 1] = states[r + 1], states[r]
+                costs[r], costs[r + 1] = costs[r + 1], costs[r]
+                counters[r], counters[r + 1] = counters[r + 1], counters[r]
+
+        it += block
+        hist_iter[n_hist] = it
+        hist_current[n_hist] = costs[0]
+        hist_best[n_hist] = best_cost
+        n_hist += 1
+
+    history = {'iter': hist_iter[:n_hist], 'current_cost': hist_current[:n_hist], 'best_cost': hist_best[:n_hist]}
+    return decode_entries(best), best_cost, history, time.perf_counter() - start_time
+
+# ----------------------------
+# Multi-start SA (independent Markov chains in worker processes)
+# ----------------------------
+def _current_inputs():
+    """Snapshot of the user inputs, picklable for worker processes."""
+    return {'courses': list(courses), 'faculty': dict(faculty), 'rooms': list(rooms), 'slots': list(slots),
+            'preferred_slots': dict(preferred_slots), 'requirements': dict(requirements)}
+
+def _sa_chain(seed, max_iter, T0, alpha, inputs):
+    """Run one SA chain on `inputs` in a worker process. Returns (best, best_cost, history)."""
+    global requirements
+    courses[:] = inputs['courses']
+    faculty.clear(); faculty.update(inputs['faculty'])
+    rooms[:] = inputs['rooms']
+    slots[:] = inputs['slots']
+    preferred_slots.clear(); preferred_slots.update(inputs['preferred_slots'])
+    requirements = inputs['requirements']
+    refresh_caches()
+
+    random.seed(seed)
+    seed_stream(seed)
+    best, best_cost, history, _ = simulated_annealing(max_iter=max_iter, T0=T0, alpha=alpha, stop_if_zero=True)
+    return best, best_cost, history
+
+def multi_start_sa(n_chains=None, max_iter=120000, T0=500.0, alpha=0.9997, seed=None):
+    """
+    Run n_chains independent SA chains in parallel (one per CPU by default) and
+    return the best one as (best, best_cost, history, elapsed). Chains do not
+    exchange states; only the final results are reduced. Process-based library
+    entry point; the GUI runs its chains through threaded_sa().
+    """
+    start_time = time.perf_counter()
+    n_chains = n_chains or os.cpu_count() or 1
+    inputs = _current_inputs()
+    seeds = random.Random(seed).sample(range(1 << 30), n_chains)
+
+    with ProcessPoolExecutor(max_workers=n_chains) as pool:
+        futures = [pool.submit(_sa_chain, s, max_iter, T0, alpha, inputs) for s in seeds]
+        results = [fut.result() for fut in futures]  # submission order: ties go to the first seed
+
+    best, best_cost, history = min(results, key=lambda r: r[1])
+    return best, best_cost, history, time.perf_counter() - start_time
+
+# ----------------------------
+# Native SA loop (numba, GIL released) for threaded multi-start
+# ----------------------------
+@njit(nogil=True, cache=True)
+def _sa_loop(tt, course_to_teacher, slot_day, slot_start, slot_valid, pref_mask, weights,
+             slot_choices, room_choices, pref_ptr, pref_sids, max_iter, T0, alpha, seed, stop_if_zero):
+    """
+    Whole SA chain in native code on an encoded timetable (modified in place).
+    Same move mix as _propose(); each move is scored with the inlined full cost, which
+    at native speed is cheap enough to need no delta bookkeeping. Runs without the GIL,
+    so several chains can share a process on separate threads; all buffers are
+    allocated up front, so the loop itself never touches the allocator.
+    Returns (best_tt, best_cost, hist_current, hist_best).
+    """
+    np.random.seed(seed)  # numba keeps one random state per thread
+    n_days = slot_day.max() + 1 if slot_day.shape[0] else 1
+    w = (weights[0], weights[1], weights[2], weights[3], weights[4], weights[5], weights[6], weights[7])
+    fac_occ = np.zeros(pref_mask.shape, dtype=np.int8)
+    room_occ = np.zeros((room_choices.max() + 1 if room_choices.shape[0] else 1, pref_mask.shape[1]), dtype=np.int8)
+    hist_current = np.empty(max_iter, dtype=np.int64)
+    hist_best = np.empty(max_iter, dtype=np.int64)
+    L = tt.shape[0]
+    keys = np.empty(L, dtype=np.int64)
+
+    current_cost = _cost_core(tt, course_to_teacher, slot_day, slot_start, slot_valid, pref_mask,
+                              fac_occ, room_occ, keys, w, n_days)
+    best = tt.copy()
+    best_cost = current_cost
+    T = T0
+    n_hist = 0
+    for it in range(max_iter):
+        if T <= 1e-8 or L == 0:
+            break
+        move = np.random.random()
+        i = np.random.randint(L)
+        # old entries kept as scalars for rollback (j == i for single-entry moves)
+        c_i, s_i, r_i = tt[i, 0], tt[i, 1], tt[i, 2]
+        j = i
+        c_j, s_j, r_j = c_i, s_i, r_i
+        if move < 0.45 and L >= 2:
+            j = np.random.randint(L - 1)
+            if j >= i:
+                j += 1
+            c_j, s_j, r_j = tt[j, 0], tt[j, 1], tt[j, 2]
+            if np.random.random() < 0.7:
+                # swap slots only
+                tt[i, 1] = s_j
+                tt[j, 1] = s_i
+            else:
+                # swap entire assignments
+                tt[i, 0], tt[i, 1], tt[i, 2] = c_j, s_j, r_j
+                tt[j, 0], tt[j, 1], tt[j, 2] = c_i, s_i, r_i
+        elif move < 0.85:
+            c = tt[i, 0]
+            n_pref = pref_ptr[c + 1] - pref_ptr[c]
+            if n_pref > 0 and np.random.random() < 0.7:
+                tt[i, 1] = pref_sids[pref_ptr[c] + np.random.randint(n_pref)]
+            else:
+                tt[i, 1] = slot_choices[np.random.randint(slot_choices.shape[0])]
+            if np.random.random() >= 0.25:
+                tt[i, 2] = room_choices[np.random.randint(room_choices.shape[0])]
+        else:
+            tt[i, 2] = room_choices[np.random.randint(room_choices.shape[0])]
+
+        neighbor_cost = _cost_core(tt, course_to_teacher, slot_day, slot_start, slot_valid, pref_mask,
+                                   fac_occ, room_occ, keys, w, n_days)
+        delta = neighbor_cost - current_cost
+        if delta < 0:
+            accept = True
+        else:
+            ratio = delta / max(T, 1e-9)
+            accept = ratio < EXP_CUTOFF and np.random.random() < np.exp(-ratio)
+        if accept:
+            current_cost = neighbor_cost
+            if current_cost < best_cost:
+                best_cost = current_cost
+                best[:, :] = tt
+        else:
+            # rollback
+            tt[j, 0], tt[j, 1], tt[j, 2] = c_j, s_j, r_j
+            tt[i, 0], tt[i, 1], tt[i, 2] = c_i, s_i, r_i
+
+        hist_current[it] = current_cost
+        hist_best[it] = best_cost
+        n_hist = it + 1
+        if stop_if_zero and best_cost == 0:
+            break
+        T *= alpha
+    return best, best_cost, hist_current[:n_hist], hist_best[:n_hist]
+
+def threaded_sa(n_chains=None, max_iter=120000, T0=500.0, alpha=0.9997, seed=None, stop_if_zero=True):
+    """
+    Multi-start SA with every chain running _sa_loop() on its own thread; the
+    jitted loop releases the GIL, so chains scale across cores without worker
+    processes or pickling. Returns (best, best_cost, history, elapsed) like simulated_annealing().
+    """
+    start_time = time.perf_counter()
+    n_chains = n_chains or os.cpu_count() or 1
+    seeds = random.Random(seed).sample(range(1 << 30), n_chains)
+    e = _enc
+    args = (e['course_to_teacher_id'], e['slot_to_day'], e['slot_to_start'], e['slot_valid'], e['pref_mask'],
+            e['weights'], e['slot_choice_arr'], e['room_choice_arr'], e['pref_ptr'], e['pref_sids'])
+
+    with ThreadPoolExecutor(max_workers=n_chains) as pool:
+        futures = [pool.submit(_sa_loop, encode_timetable(random_solution(make_stream(s))), *args,
+                               max_iter, T0, alpha, s, stop_if_zero) for s in seeds]
+        results = [fut.result() for fut in futures]  # submission order: ties go to the first seed
+
+    best, best_cost, hist_current, hist_best = min(results, key=lambda r: r[1])
+    history = {'iter': np.arange(1, len(hist_current) + 1, dtype=np.int64),
+               'current_cost': hist_current, 'best_cost': hist_best}
+    best = decode_entries([tuple(row) for row in best.tolist()])
+    return best, int(best_cost), history, time.perf_counter() - start_time
 
 # ----------------------------
 # Analyzer Results (unchanged behavior, small cache usage)
 # ----------------------------
+def preferred_slot_matches(timetable):
+    """(hits, total): entries whose teacher has preferences, and how many sit in a preferred slot."""
+    pref_sets = _pref_sets
+    prefs = [pref_sets.get(faculty.get(course, "")) for course, _, _ in timetable]
+    total = sum(1 for p in prefs if p is not None)
+    hits = sum(1 for p, (_, slot, _) in zip(prefs, timetable) if p is not None and slot in p)
+    return hits, total
+
 def analyze_results(best_tt, init_cost):
     best_cost = cost_function(best_tt)
-
-    pref_hits = 0
-    total_with_prefs = 0
-    for course, slot, room in best_tt:
-        teacher = faculty.get(course, "")
-        if teacher in preferred_slots:
-            total_with_prefs += 1
-            if slot in preferred_slots[teacher]:
-                pref_hits += 1
+    pref_hits, total_with_prefs = preferred_slot_matches(best_tt)
 
     summary = (
         f"--- Timetable Analysis ---\n"
@@ -317,27 +980,33 @@ def save_pdf(timetable, filename="Lab_timetable.pdf"):
     doc = SimpleDocTemplate(filename, pagesize=legal, rightMargin=20, leftMargin=20, topMargin=30, bottomMargin=20)
     styles = getSampleStyleSheet()
     cell_style = ParagraphStyle('cell', parent=styles['Normal'], fontSize=9, alignment=1)
-    header_style = ParagraphStyle('header', parent=styles['Normal'], fontSize=10, textColor=colors.white, alignment=1, fontName="Helvetica-Bold")
+    col_widths = [200, 120, 80, 120]
+    # cells are plain strings styled once by the TableStyle; only text too wide for
+    # its column (minus the 6pt side paddings) becomes a wrapping Paragraph
+    fits = [w - 12 for w in col_widths]
 
-    data = [[Paragraph("Course", header_style), Paragraph("Teacher", header_style),
-             Paragraph("Room", header_style), Paragraph("Slot", header_style)]]
+    def cell(text, col):
+        if stringWidth(text, "Helvetica", 9) <= fits[col]:
+            return text
+        return Paragraph(escape(text), cell_style)
 
-    for course, slot, room in timetable:
-        data.append([Paragraph(course, cell_style), Paragraph(faculty.get(course, ""), cell_style),
-                     Paragraph(room, cell_style), Paragraph(slot, cell_style)])
+    data = [["Course", "Teacher", "Room", "Slot"]]
+    data.extend([cell(course, 0), cell(faculty.get(course, ""), 1), cell(room, 2), cell(slot, 3)]
+                for course, slot, room in timetable)
 
-    table = Table(data, colWidths=[200, 120, 80, 120])
+    table = Table(data, colWidths=col_widths)
     style = TableStyle([
         ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#800000")),
         ('TEXTCOLOR',(0,0),(-1,0),colors.white),
+        ('FONTNAME',(0,0),(-1,0),"Helvetica-Bold"),
+        ('FONTSIZE',(0,0),(-1,0),10),
+        ('FONTSIZE',(0,1),(-1,-1),9),
+        ('ROWBACKGROUNDS',(0,1),(-1,-1),[colors.HexColor("#FDF2F2"), colors.HexColor("#FDEDEC")]),
         ('GRID',(0,0),(-1,-1),0.5,colors.black),
-        ('ALIGN',(0,0),(-1,-1),'CENTER')
+        ('ALIGN',(0,0),(-1,-1),'CENTER'),
+        ('VALIGN',(0,0),(-1,-1),'MIDDLE')
     ])
 
-    for row in range(1, len(data)):
-        bg = colors.HexColor("#FDEDEC") if row % 2 == 0 else colors.HexColor("#FDF2F2")
-        style.add('BACKGROUND', (0,row), (-1,row), bg)
-
     table.setStyle(style)
     elements = [
         Paragraph("<b><font color='#800000'>Lab TimeTable By Ali Raza (Improved)</font></b>", styles['Title']),
@@ -356,7 +1025,7 @@ def save_pdf(timetable, filename="Lab_timetable.pdf"):
 # Plotting function (static save)
 # ----------------------------
 def plot_history(history, image_path='sa_progress.png'):
-    if not history or not history['iter']:
+    if not history or len(history['iter']) == 0:
         return None
 
     iters = history['iter']
@@ -381,6 +1050,17 @@ def plot_history(history, image_path='sa_progress.png'):
 # ----------------------------
 # Load Inputs from File (kept, but refresh caches after load)
 # ----------------------------
+def parse_input_file(content):
+    """
+    Read `name = <literal>` assignments (courses = [...], faculty = {...}, ...) from an
+    input file. Values go through ast.literal_eval, so the file is never executed.
+    """
+    env = {}
+    for node in ast.parse(content, mode='exec').body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            env[node.targets[0].id] = ast.literal_eval(node.value)
+    return env
+
 def load_inputs_from_file():
     file_path = filedialog.askopenfilename(
         title="Select Input File",
@@ -389,25 +1069,32 @@ def load_inputs_from_file():
     if not file_path:
         return
 
-    try:
-        with open(file_path, "r") as f:
-            content = f.read()
+    def apply_inputs(env):
+        try:
+            courses.clear(); courses.extend(env.get("courses", []))
+            faculty.clear(); faculty.update(env.get("faculty", {}))
+            rooms.clear(); rooms.extend(env.get("rooms", []))
+            slots.clear(); slots.extend(env.get("slots", []))
+            preferred_slots.clear(); preferred_slots.update(env.get("preferred_slots", {}))
 
-        env = {}
-        exec(content, {}, env)
+            # refresh caches after loading new inputs
+            refresh_caches()
 
-        courses.clear(); courses.extend(env.get("courses", []))
-        faculty.clear(); faculty.update(env.get("faculty", {}))
-        rooms.clear(); rooms.extend(env.get("rooms", []))
-        slots.clear(); slots.extend(env.get("slots", []))
-        preferred_slots.clear(); preferred_slots.update(env.get("preferred_slots", {}))
+            messagebox.showinfo("Success", f"✅ Inputs loaded from {file_path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load file:\n{e}")
 
-        # refresh caches after loading new inputs
-        refresh_caches()
+    def worker():
+        # file IO and parsing off the Tk thread; results are handed back through root.after
+        try:
+            with open(file_path, "r") as f:
+                env = parse_input_file(f.read())
+        except Exception as e:
+            root.after(0, lambda err=e: messagebox.showerror("Error", f"Failed to load file:\n{err}"))
+            return
+        root.after(0, lambda: apply_inputs(env))
 
-        messagebox.showinfo("Success", f"✅ Inputs loaded from {file_path}")
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to load file:\n{e}")
+    threading.Thread(target=worker, daemon=True).start()
 
 # ----------------------------
 # Generate Timetable (kept behavior)
@@ -428,10 +1115,11 @@ def generate_timetable():
     init_sol = random_solution()
     init_cost = cost_function(init_sol)
 
-    # SA settings (same defaults)
+    # SA settings (same defaults); without the live plot, SA_CHAINS native chains run on threads
     max_iter = 120000
     T0 = 500.0
     alpha = 0.9997
+    live_plot = live_plot_var.get()
 
     if max_iter > 50000:
         update_interval = 50
@@ -440,22 +1128,19 @@ def generate_timetable():
     else:
         update_interval = 5
 
-    best_tt, best_cost, history, elapsed = simulated_annealing(
-        max_iter=max_iter, T0=T0, alpha=alpha, stop_if_zero=True, live_plot=True, update_interval=update_interval
-    )
+    if not live_plot:
+        best_tt, best_cost, history, elapsed = threaded_sa(n_chains=SA_CHAINS, max_iter=max_iter, T0=T0, alpha=alpha)
+    else:
+        best_tt, best_cost, history, elapsed = simulated_annealing(
+            max_iter=max_iter, T0=T0, alpha=alpha, stop_if_zero=True, live_plot=True, update_interval=update_interval
+        )
 
     preview_box.delete("1.0", tk.END)
     for course, slot, room in best_tt:
         preview_box.insert(tk.END, f"{course:55} | {faculty.get(course):20} | {room:10} | {slot}\n")
 
     # Analysis section
-    pref_hits, total_with_prefs = 0, 0
-    for course, slot, room in best_tt:
-        teacher = faculty.get(course, "")
-        if teacher in preferred_slots:
-            total_with_prefs += 1
-            if slot in preferred_slots[teacher]:
-                pref_hits += 1
+    pref_hits, total_with_prefs = preferred_slot_matches(best_tt)
 
     analysis = (
         "\n--- Timetable Analysis ---\n"
@@ -475,95 +1160,101 @@ def generate_timetable():
 # ----------------------------
 # GUI (single Tk instance only)
 # ----------------------------
-root = tk.Tk()
-root.title("AI Timetable Generator by Ali Raza")
-root.configure(bg="#1C1C1C")
-root.geometry("980x690")
-
-tk.Label(root, text="Lab Timetable Generator Using Simulated Annealing by Ali Raza",
-         font=("Arial", 18, "bold"), fg="white", bg="#800000", pady=14).pack(fill="x")
-
-main_frame = tk.Frame(root, bg="#1C1C1C")
-main_frame.pack(fill="both", expand=True, padx=20, pady=20)
-
-button_frame = tk.Frame(main_frame, bg="#1C1C1C")
-button_frame.pack(side="left", padx=25, pady=30, fill="y")
-
-def show_input_window(title, var):
-    def save_data():
-        try:
-            val = eval(input_box.get("1.0", tk.END).strip())
-            var.clear()
-            if isinstance(var, list):
-                var.extend(val)
-            elif isinstance(var, dict):
-                var.update(val)
-
-            # refresh caches whenever user changes slots/faculty/courses
-            if title in ("Slots", "Faculty", "Courses"):
-                refresh_caches()
-
-            messagebox.showinfo("Saved", f"{title} saved successfully!")
-            win.destroy()
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-    win = tk.Toplevel(root)
-    win.title(title)
-    input_box = scrolledtext.ScrolledText(win, width=60, height=10)
-    input_box.pack(padx=10, pady=10)
-    tk.Button(win, text="Save", bg="#800000", fg="white", font=("Arial", 10, "bold"),
-              command=save_data).pack(pady=5)
-
-def on_enter(e):
-    e.widget['background'] = e.widget.hover_color
-
-def on_leave(e):
-    e.widget['background'] = e.widget.default_color
-
-btn_style = {"font": ("Arial", 11, "bold"), "fg": "white", "height": 2, "width": 22, "relief": "flat", "cursor": "hand2"}
-
-def make_button(parent, text, bg, hover_bg, cmd):
-    btn = tk.Button(parent, text=text, bg=bg, **btn_style, command=cmd)
-    btn.default_color = bg
-    btn.hover_color = hover_bg
-    btn.bind("<Enter>", on_enter)
-    btn.bind("<Leave>", on_leave)
-    btn.pack(pady=12, fill='x')
-    return btn
-
-btn_courses = make_button(button_frame, "📘 Add Courses", "#3498DB", "#2E86C1", lambda: show_input_window("Courses", courses))
-btn_faculty = make_button(button_frame, "👨‍🏫 Add Faculty", "#27AE60", "#1E8449", lambda: show_input_window("Faculty", faculty))
-btn_rooms = make_button(button_frame, "🏫 Add Rooms", "#F1C40F", "#D4AC0D", lambda: show_input_window("Rooms", rooms))
-btn_slots = make_button(button_frame, "⏰ Add Slots", "#9B59B6", "#884EA0", lambda: show_input_window("Slots", slots))
-btn_prefs = make_button(button_frame, "⭐ Preferred Slots", "#E67E22", "#CA6F1E", lambda: show_input_window("Preferred Slots", preferred_slots))
-btn_load = make_button(button_frame, "📂 Load Inputs from File", "#2ECC71", "#28B463", load_inputs_from_file)
-
-preview_frame = tk.Frame(main_frame, bg="#1C1C1C")
-preview_frame.pack(side="right", padx=20, pady=10, fill="both", expand=True)
-
-preview_box = scrolledtext.ScrolledText(preview_frame, width=85, height=25, font=("Consolas", 10))
-preview_box.pack(fill="both", expand=True, padx=10, pady=10)
-
-action_frame = tk.Frame(root, bg="#1C1C1C", height=80)
-action_frame.pack(side="bottom", fill="x")
-action_frame.pack_propagate(False)
-
-btn_generate = tk.Button(action_frame, text="🚀 Generate Timetable & PDF", bg="#800000", fg="white",
-                         font=("Arial", 12, "bold"), padx=20, pady=10, width=28, relief="flat",
-                         command=generate_timetable)
-btn_generate.pack(side="left", padx=80, pady=(5, 20))
-btn_generate.default_color = "#800000"
-btn_generate.hover_color = "#A93226"
-btn_generate.bind("<Enter>", on_enter)
-btn_generate.bind("<Leave>", on_leave)
-
-btn_close = tk.Button(action_frame, text="❌ Close", bg="#E74C3C", fg="white",
-                      font=("Arial", 12, "bold"), padx=20, pady=10, width=15, relief="flat",
-                      command=root.destroy)
-btn_close.pack(side="right", padx=80, pady=(5, 20))
-btn_close.default_color = "#E74C3C"
-btn_close.hover_color = "#C0392B"
-btn_close.bind("<Enter>", on_enter)
-btn_close.bind("<Leave>", on_leave)
-
-root.mainloop()
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("AI Timetable Generator by Ali Raza")
+    root.configure(bg="#1C1C1C")
+    root.geometry("980x690")
+
+    tk.Label(root, text="Lab Timetable Generator Using Simulated Annealing by Ali Raza",
+             font=("Arial", 18, "bold"), fg="white", bg="#800000", pady=14).pack(fill="x")
+
+    main_frame = tk.Frame(root, bg="#1C1C1C")
+    main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+
+    button_frame = tk.Frame(main_frame, bg="#1C1C1C")
+    button_frame.pack(side="left", padx=25, pady=30, fill="y")
+
+    def show_input_window(title, var):
+        def save_data():
+            try:
+                val = ast.literal_eval(input_box.get("1.0", tk.END).strip())
+                var.clear()
+                if isinstance(var, list):
+                    var.extend(val)
+                elif isinstance(var, dict):
+                    var.update(val)
+
+                # refresh caches whenever user changes slots/faculty/courses
+                if title in ("Slots", "Faculty", "Courses"):
+                    refresh_caches()
+
+                messagebox.showinfo("Saved", f"{title} saved successfully!")
+                win.destroy()
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+        win = tk.Toplevel(root)
+        win.title(title)
+        input_box = scrolledtext.ScrolledText(win, width=60, height=10)
+        input_box.pack(padx=10, pady=10)
+        tk.Button(win, text="Save", bg="#800000", fg="white", font=("Arial", 10, "bold"),
+                  command=save_data).pack(pady=5)
+
+    def on_enter(e):
+        e.widget['background'] = e.widget.hover_color
+
+    def on_leave(e):
+        e.widget['background'] = e.widget.default_color
+
+    btn_style = {"font": ("Arial", 11, "bold"), "fg": "white", "height": 2, "width": 22, "relief": "flat", "cursor": "hand2"}
+
+    def make_button(parent, text, bg, hover_bg, cmd):
+        btn = tk.Button(parent, text=text, bg=bg, **btn_style, command=cmd)
+        btn.default_color = bg
+        btn.hover_color = hover_bg
+        btn.bind("<Enter>", on_enter)
+        btn.bind("<Leave>", on_leave)
+        btn.pack(pady=12, fill='x')
+        return btn
+
+    btn_courses = make_button(button_frame, "📘 Add Courses", "#3498DB", "#2E86C1", lambda: show_input_window("Courses", courses))
+    btn_faculty = make_button(button_frame, "👨‍🏫 Add Faculty", "#27AE60", "#1E8449", lambda: show_input_window("Faculty", faculty))
+    btn_rooms = make_button(button_frame, "🏫 Add Rooms", "#F1C40F", "#D4AC0D", lambda: show_input_window("Rooms", rooms))
+    btn_slots = make_button(button_frame, "⏰ Add Slots", "#9B59B6", "#884EA0", lambda: show_input_window("Slots", slots))
+    btn_prefs = make_button(button_frame, "⭐ Preferred Slots", "#E67E22", "#CA6F1E", lambda: show_input_window("Preferred Slots", preferred_slots))
+    btn_load = make_button(button_frame, "📂 Load Inputs from File", "#2ECC71", "#28B463", load_inputs_from_file)
+
+    preview_frame = tk.Frame(main_frame, bg="#1C1C1C")
+    preview_frame.pack(side="right", padx=20, pady=10, fill="both", expand=True)
+
+    preview_box = scrolledtext.ScrolledText(preview_frame, width=85, height=25, font=("Consolas", 10))
+    preview_box.pack(fill="both", expand=True, padx=10, pady=10)
+
+    action_frame = tk.Frame(root, bg="#1C1C1C", height=80)
+    action_frame.pack(side="bottom", fill="x")
+    action_frame.pack_propagate(False)
+
+    btn_generate = tk.Button(action_frame, text="🚀 Generate Timetable & PDF", bg="#800000", fg="white",
+                             font=("Arial", 12, "bold"), padx=20, pady=10, width=28, relief="flat",
+                             command=generate_timetable)
+    btn_generate.pack(side="left", padx=80, pady=(5, 20))
+    btn_generate.default_color = "#800000"
+    btn_generate.hover_color = "#A93226"
+    btn_generate.bind("<Enter>", on_enter)
+    btn_generate.bind("<Leave>", on_leave)
+
+    live_plot_var = tk.BooleanVar(value=True)
+    tk.Checkbutton(action_frame, text="Live SA plot (off: parallel chains)", variable=live_plot_var,
+                   font=("Arial", 10, "bold"), fg="white", bg="#1C1C1C", selectcolor="#1C1C1C",
+                   activebackground="#1C1C1C", activeforeground="white").pack(side="left", pady=(5, 20))
+
+    btn_close = tk.Button(action_frame, text="❌ Close", bg="#E74C3C", fg="white",
+                          font=("Arial", 12, "bold"), padx=20, pady=10, width=15, relief="flat",
+                          command=root.destroy)
+    btn_close.pack(side="right", padx=80, pady=(5, 20))
+    btn_close.default_color = "#E74C3C"
+    btn_close.hover_color = "#C0392B"
+    btn_close.bind("<Enter>", on_enter)
+    btn_close.bind("<Leave>", on_leave)
+
+    root.mainloop()